@@ -1,68 +1,169 @@
 import pygame
-import random
+import numpy as np
 import time
 import math
 import json
+import heapq
 import os
-from typing import List, Tuple, Set, Dict
+from typing import ClassVar, List, Tuple, Set, Dict
 from enum import Enum
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the kernels below then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 pygame.init()
 
-@dataclass
-class Particle:
-    x: float
-    y: float
-    dx: float
-    dy: float
-    lifetime: float
-    color: Tuple[int, int, int]
-    size: float
-    start_time: float
-
-    def update(self) -> bool:
-        current_time = time.time()
-        progress = (current_time - self.start_time) / self.lifetime
-        if progress >= 1:
-            return False
-        
-        self.x += self.dx
-        self.y += self.dy
-        self.dy += 0.5  # Gravity
-        self.size = max(1, self.size * (1 - progress))
-        return True
+# An explicit signature compiles (or loads from cache) eagerly at import,
+# so the first reveal click doesn't stall while Numba compiles
+@njit('int32[::1](int8[::1], boolean[::1], boolean[::1], int64, int64, '
+      'int64[::1], int64[::1], int32[::1])', cache=True)
+def _flood(grid, revealed, flagged, size, start, offsets, dxs, queue):
+    """Breadth-first reveal over flattened board arrays.
 
-    def draw(self, screen: pygame.Surface, offset_y: int = 100):
-        pygame.draw.circle(screen, self.color, 
-                         (int(self.x), int(self.y) + offset_y), 
-                         int(self.size))
+    Marks cells revealed in place and returns the flat indices it revealed,
+    in order. `queue` must hold at least size * size entries.
+    """
+    if revealed[start] or flagged[start]:
+        return queue[:0]
+    cells = size * size
+    revealed[start] = True
+    queue[0] = start
+    head, tail = 0, 1
+    while head < tail:
+        i = queue[head]
+        head += 1
+        if grid[i] != 0:
+            continue
+        cx = i % size
+        for k in range(len(offsets)):
+            j = i + offsets[k]
+            # Reject steps that wrap past the left/right edge
+            if (0 <= cx + dxs[k] < size and 0 <= j < cells and
+                    not revealed[j] and not flagged[j]):
+                revealed[j] = True
+                queue[tail] = j
+                tail += 1
+    return queue[:tail]
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles: List[Particle] = []
+    FIELDS = ('x', 'y', 'dx', 'dy', 'size', 'lifetime', 'start_time')
+    # Unit-circle lookup table for explosion directions
+    _ANGLES = np.linspace(0, 2 * np.pi, 256, endpoint=False)
+    _COS = np.cos(_ANGLES).astype(np.float32)
+    _SIN = np.sin(_ANGLES).astype(np.float32)
+
+    def __init__(self, capacity: int = 64):
+        # Struct-of-arrays storage; only the first `count` slots are live
+        self.count = 0
+        self.epoch = time.time()  # start_time is stored relative to this
+        self.rng = np.random.default_rng()
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=np.float32) for name in self.FIELDS
+        }
+        self.colors = np.zeros((capacity, 3), dtype=np.uint8)
+        # Particles are drawn once per frame into a transparent layer, which
+        # is then blitted into however many screen regions need it
+        self._fx_layer: pygame.Surface = None
+        self._layer_rect: pygame.Rect = None  # Part of the layer holding particles
+        self._layer_stale = True
+
+    def _reserve(self, extra: int):
+        capacity = len(self.colors)
+        if self.count + extra <= capacity:
+            return
+        while capacity < self.count + extra:
+            capacity *= 2
+        for name, arr in self.arrays.items():
+            grown = np.zeros(capacity, dtype=arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            self.arrays[name] = grown
+        grown = np.zeros((capacity, 3), dtype=np.uint8)
+        grown[:self.count] = self.colors[:self.count]
+        self.colors = grown
     
     def add_explosion(self, x: int, y: int, color: Tuple[int, int, int], 
                      count: int = 20, size: float = 3):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.particles.append(Particle(
-                x=x,
-                y=y,
-                dx=math.cos(angle) * speed,
-                dy=math.sin(angle) * speed - 2,
-                lifetime=random.uniform(0.5, 1.0),
-                color=color,
-                size=size,
-                start_time=time.time()
-            ))
+        self._reserve(count)
+        s = slice(self.count, self.count + count)
+        directions = self.rng.integers(0, len(self._COS), count)
+        speeds = self.rng.uniform(2, 5, count)
+        a = self.arrays
+        a['x'][s] = x
+        a['y'][s] = y
+        a['dx'][s] = self._COS[directions] * speeds
+        a['dy'][s] = self._SIN[directions] * speeds - 2
+        a['size'][s] = size
+        a['lifetime'][s] = self.rng.uniform(0.5, 1.0, count)
+        a['start_time'][s] = time.time() - self.epoch
+        self.colors[s] = tuple(color)[:3]
+        self.count += count
+        self._layer_stale = True
     
-    def update_and_draw(self, screen: pygame.Surface):
-        self.particles = [p for p in self.particles if p.update()]
-        for particle in self.particles:
-            particle.draw(screen)
+    def update(self, now: float):
+        self._layer_stale = True
+        n = self.count
+        if n == 0:
+            return
+        a = self.arrays
+        x, y, dx, dy, size = (a[name][:n] for name in ('x', 'y', 'dx', 'dy', 'size'))
+        progress = (now - self.epoch - a['start_time'][:n]) / a['lifetime'][:n]
+        x += dx
+        y += dy
+        dy += 0.5  # Gravity
+        np.maximum(1, size * (1 - progress), out=size)
+
+        # Compact surviving particles to the front of the buffers
+        alive = progress < 1
+        k = int(alive.sum())
+        if k < n:
+            for arr in a.values():
+                arr[:k] = arr[:n][alive]
+            self.colors[:k] = self.colors[:n][alive]
+            self.count = k
+
+    def bounds(self, offset_y: int = 100) -> pygame.Rect:
+        """Screen rect covering every live particle, or None when there are none."""
+        n = self.count
+        if n == 0:
+            return None
+        a = self.arrays
+        x, y, r = a['x'][:n], a['y'][:n], a['size'][:n]
+        left, top = int((x - r).min()) - 2, int((y - r).min()) - 2 + offset_y
+        right, bottom = int((x + r).max()) + 2, int((y + r).max()) + 2 + offset_y
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def _render_layer(self, size: Tuple[int, int], offset_y: int):
+        if self._fx_layer is None or self._fx_layer.get_size() != size:
+            self._fx_layer = pygame.Surface(size, pygame.SRCALPHA)
+        elif self._layer_rect:
+            self._fx_layer.fill((0, 0, 0, 0), self._layer_rect)
+        self._layer_stale = False
+        
+        n = self.count
+        if n == 0:
+            self._layer_rect = None
+            return
+        a = self.arrays
+        # Draw grouped by color so consecutive calls share the same fill
+        colors = self.colors[:n].astype(np.int32)
+        order = np.argsort((colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2], kind='stable')
+        for px, py, radius, color in zip(a['x'][:n][order].astype(int).tolist(),
+                                         a['y'][:n][order].astype(int).tolist(),
+                                         a['size'][:n][order].astype(int).tolist(),
+                                         self.colors[:n][order].tolist()):
+            pygame.draw.circle(self._fx_layer, color, (px, py + offset_y), radius)
+        self._layer_rect = self.bounds(offset_y).clip(self._fx_layer.get_rect())
+
+    def draw(self, screen: pygame.Surface, offset_y: int = 100):
+        if self._layer_stale:
+            self._render_layer(screen.get_size(), offset_y)
+        if self._layer_rect:
+            screen.blit(self._fx_layer, self._layer_rect.topleft, self._layer_rect)
 
 class Achievement:
     def __init__(self, name: str, description: str, icon: str):
@@ -88,22 +189,32 @@ class AchievementManager:
             'hard_victory': Achievement('Expert', 'Win on hard difficulty', '👑')
         }
         self.recent_unlocks: List[Achievement] = []
+        self._pending: Set[str] = set(self.achievements)  # Names still locked
+
+    def unlock(self, name: str):
+        self._pending.discard(name)
+        self.achievements[name].unlock()
     
     def check_achievements(self, game: 'Minesweeper'):
+        pending = self._pending
+        if not pending:
+            return
+
         if game.win:
-            self.achievements['first_win'].unlock()
-            if game.elapsed_time < 30:
-                self.achievements['speed_demon'].unlock()
-            if game.difficulty == Difficulty.HARD:
-                self.achievements['hard_victory'].unlock()
-            if not any(game.misplaced_flags):
-                self.achievements['perfectionist'].unlock()
+            if 'first_win' in pending:
+                self.unlock('first_win')
+            if 'speed_demon' in pending and game.elapsed_time < 30:
+                self.unlock('speed_demon')
+            if 'hard_victory' in pending and game.difficulty == Difficulty.HARD:
+                self.unlock('hard_victory')
+            if 'perfectionist' in pending and not game.misplaced_flags:
+                self.unlock('perfectionist')
         
-        if game.max_combo >= 10:
-            self.achievements['combo_master'].unlock()
+        if 'combo_master' in pending and game.max_combo >= 10:
+            self.unlock('combo_master')
         
-        if game.themes_tried == len(game.themes):
-            self.achievements['theme_explorer'].unlock()
+        if 'theme_explorer' in pending and len(game.themes_tried) == len(game.themes):
+            self.unlock('theme_explorer')
 
 class PowerUp(ABC):
     def __init__(self, duration: float = None):
@@ -115,31 +226,32 @@ class PowerUp(ABC):
     def activate(self, game: 'Minesweeper', x: int, y: int): pass
     
     @abstractmethod
-    def update(self, game: 'Minesweeper'): pass
+    def update(self, game: 'Minesweeper', now: float): pass
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: float) -> bool:
         if not self.active or self.duration is None:
             return False
-        return time.time() - self.start_time > self.duration
+        return now - self.start_time > self.duration
 
 class RevealAreaPowerUp(PowerUp):
     def activate(self, game: 'Minesweeper', x: int, y: int):
         self.active = True
+        now = time.time()
         for dx in range(-2, 3):
             for dy in range(-2, 3):
                 new_x, new_y = x + dx, y + dy
                 if (0 <= new_x < game.GRID_SIZE and 
                     0 <= new_y < game.GRID_SIZE and
-                    not game.revealed[new_y][new_x] and
-                    game.grid[new_y][new_x] != -1):
-                    game.reveal_cell(new_x, new_y)
+                    not game.revealed[new_y, new_x] and
+                    game.grid[new_y, new_x] != -1):
+                    game.reveal_cell(new_x, new_y, now)
                     game.particles.add_explosion(
                         new_x * game.CELL_SIZE + game.CELL_SIZE // 2,
                         new_y * game.CELL_SIZE + game.CELL_SIZE // 2,
-                        game.theme['BLUE'], 10, 2
+                        game.theme.BLUE, 10, 2
                     )
     
-    def update(self, game: 'Minesweeper'): pass
+    def update(self, game: 'Minesweeper', now: float): pass
 
 class TimeFreezeePowerUp(PowerUp):
     def __init__(self):
@@ -151,8 +263,8 @@ class TimeFreezeePowerUp(PowerUp):
         self.start_time = time.time()
         self.frozen_time = game.elapsed_time
     
-    def update(self, game: 'Minesweeper'):
-        if self.active and not self.is_expired():
+    def update(self, game: 'Minesweeper', now: float):
+        if self.active and not self.is_expired(now):
             game.elapsed_time = self.frozen_time
 
 class SafetyNetPowerUp(PowerUp):
@@ -163,8 +275,8 @@ class SafetyNetPowerUp(PowerUp):
         self.active = True
         self.start_time = time.time()
     
-    def update(self, game: 'Minesweeper'):
-        if self.active and self.is_expired():
+    def update(self, game: 'Minesweeper', now: float):
+        if self.active and self.is_expired(now):
             self.active = False
 
 class Difficulty(Enum):
@@ -172,87 +284,139 @@ class Difficulty(Enum):
     MEDIUM = (15, 35)   # 15x15, 35 mines
     HARD = (20, 80)     # 20x20, 80 mines
 
+@dataclass(frozen=True, slots=True)
 class Theme:
-    CLASSIC = {
-        'WHITE': (255, 255, 255),
-        'GRAY': (192, 192, 192),
-        'DARK_GRAY': (128, 128, 128),
-        'BLACK': (0, 0, 0),
-        'RED': (255, 0, 0),
-        'BLUE': (0, 0, 255),
-        'GREEN': (0, 128, 0),
-        'NUMBERS': [(0, 0, 255), (0, 128, 0), (255, 0, 0), (0, 0, 128),
-                   (128, 0, 0), (0, 128, 128), (0, 0, 0), (128, 128, 128)]
-    }
-    
-    DARK = {
-        'WHITE': (200, 200, 200),
-        'GRAY': (40, 40, 40),
-        'DARK_GRAY': (30, 30, 30),
-        'BLACK': (0, 0, 0),
-        'RED': (255, 69, 58),
-        'BLUE': (10, 132, 255),
-        'GREEN': (48, 209, 88),
-        'NUMBERS': [(10, 132, 255), (48, 209, 88), (255, 69, 58), (191, 90, 242),
-                   (255, 159, 10), (94, 92, 230), (255, 214, 10), (172, 172, 172)]
-    }
-    
-    NATURE = {
-        'WHITE': (236, 240, 241),
-        'GRAY': (60, 179, 113),
-        'DARK_GRAY': (46, 139, 87),
-        'BLACK': (0, 100, 0),
-        'RED': (220, 20, 60),
-        'BLUE': (30, 144, 255),
-        'GREEN': (34, 139, 34),
-        'NUMBERS': [(30, 144, 255), (34, 139, 34), (220, 20, 60), (147, 112, 219),
-                   (218, 165, 32), (72, 61, 139), (210, 105, 30), (119, 136, 153)]
-    }
+    """A colour palette shared by every game.
+
+    Only the fields are frozen; the pygame.Color values are still mutable
+    and must not be modified in place.
+    """
+    CLASSIC: ClassVar['Theme']
+    DARK: ClassVar['Theme']
+    NATURE: ClassVar['Theme']
+
+    WHITE: pygame.Color
+    GRAY: pygame.Color
+    DARK_GRAY: pygame.Color
+    BLACK: pygame.Color
+    RED: pygame.Color
+    BLUE: pygame.Color
+    GREEN: pygame.Color
+    NUMBERS: Tuple[pygame.Color, ...]
+
+    @classmethod
+    def from_rgb(cls, numbers, **colors) -> 'Theme':
+        """Build a theme from RGB tuples, converting them to pygame.Color once."""
+        return cls(NUMBERS=tuple(pygame.Color(rgb) for rgb in numbers),
+                   **{name: pygame.Color(rgb) for name, rgb in colors.items()})
+
+Theme.CLASSIC = Theme.from_rgb(
+    WHITE=(255, 255, 255),
+    GRAY=(192, 192, 192),
+    DARK_GRAY=(128, 128, 128),
+    BLACK=(0, 0, 0),
+    RED=(255, 0, 0),
+    BLUE=(0, 0, 255),
+    GREEN=(0, 128, 0),
+    numbers=[(0, 0, 255), (0, 128, 0), (255, 0, 0), (0, 0, 128),
+             (128, 0, 0), (0, 128, 128), (0, 0, 0), (128, 128, 128)]
+)
+
+Theme.DARK = Theme.from_rgb(
+    WHITE=(200, 200, 200),
+    GRAY=(40, 40, 40),
+    DARK_GRAY=(30, 30, 30),
+    BLACK=(0, 0, 0),
+    RED=(255, 69, 58),
+    BLUE=(10, 132, 255),
+    GREEN=(48, 209, 88),
+    numbers=[(10, 132, 255), (48, 209, 88), (255, 69, 58), (191, 90, 242),
+             (255, 159, 10), (94, 92, 230), (255, 214, 10), (172, 172, 172)]
+)
+
+Theme.NATURE = Theme.from_rgb(
+    WHITE=(236, 240, 241),
+    GRAY=(60, 179, 113),
+    DARK_GRAY=(46, 139, 87),
+    BLACK=(0, 100, 0),
+    RED=(220, 20, 60),
+    BLUE=(30, 144, 255),
+    GREEN=(34, 139, 34),
+    numbers=[(30, 144, 255), (34, 139, 34), (220, 20, 60), (147, 112, 219),
+             (218, 165, 32), (72, 61, 139), (210, 105, 30), (119, 136, 153)]
+)
 
 class Animation:
     def __init__(self):
-        self.active_cells = []  # [(x, y, start_time, duration, type), ...]
+        self.active_cells: Dict[Tuple[int, int], Tuple[float, float, str]] = {}  # (x, y) -> (start_time, duration, type)
         self.reveal_radius = 0
         self.last_pulse = 0
         self.flag_wave = 0
+        self.now = time.time()  # Frame time, refreshed by update()
+        self.finished: List[Tuple[int, int]] = []  # Cells whose animation just ended
+        self._expiry: List[Tuple[float, Tuple[int, int]]] = []  # Min-heap of (end_time, cell)
         
-    def add_reveal(self, x: int, y: int, anim_type: str = 'reveal'):
-        self.active_cells.append((x, y, time.time(), 0.3, anim_type))
+    def add_reveal(self, x: int, y: int, start: float, anim_type: str = 'reveal'):
+        duration = 0.3
+        self.active_cells[(x, y)] = (start, duration, anim_type)
+        heapq.heappush(self._expiry, (start + duration, (x, y)))
         
-    def update(self):
-        current_time = time.time()
-        self.active_cells = [(x, y, start, duration, atype) for x, y, start, duration, atype in self.active_cells
-                            if current_time - start < duration]
+    def update(self, now: float):
+        self.now = now
+        self.finished = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, cell = heapq.heappop(self._expiry)
+            # A newer animation may have replaced this one; leave that running
+            anim = self.active_cells.get(cell)
+            if anim is not None and anim[0] + anim[1] <= now:
+                del self.active_cells[cell]
+                self.finished.append(cell)
         
         # Update pulse effect
-        self.reveal_radius = 1 + math.sin(current_time * 2) * 0.1
+        self.reveal_radius = 1 + math.sin(now * 2) * 0.1
         # Update flag wave
-        self.flag_wave = math.sin(current_time * 4) * 3
+        self.flag_wave = math.sin(now * 4) * 3
         
     def get_cell_scale(self, x: int, y: int) -> float:
-        for cell_x, cell_y, start, duration, atype in self.active_cells:
-            if cell_x == x and cell_y == y:
-                progress = (time.time() - start) / duration
-                if atype == 'reveal':
-                    if progress < 0.5:
-                        return 1.0 + (1.0 - progress * 2) * 0.2
-                elif atype == 'chord':
-                    return 1.0 + math.sin(progress * math.pi) * 0.1
-        return 1.0 * self.reveal_radius
+        anim = self.active_cells.get((x, y))
+        if anim is None:
+            return self.reveal_radius
+        start, duration, atype = anim
+        progress = (self.now - start) / duration
+        if atype == 'reveal':
+            if progress < 0.5:
+                return 1.0 + (1.0 - progress * 2) * 0.2
+        elif atype == 'chord':
+            return 1.0 + math.sin(progress * math.pi) * 0.1
+        return self.reveal_radius
 
     def get_flag_offset(self) -> float:
         return self.flag_wave
 
+    def changed_cells(self) -> List[Tuple[int, int]]:
+        """Cells that look different this frame: animating or just finished."""
+        return list(self.active_cells) + self.finished
+
 class Minesweeper:
+    FPS = 60
+    IDLE_FPS = 15
+    TEXT_CACHE_SIZE = 1000
+    NEIGHBORS = ((-1, -1), (0, -1), (1, -1),
+                 (-1, 0),           (1, 0),
+                 (-1, 1),  (0, 1),  (1, 1))
+
     def __init__(self):
         self.difficulty = Difficulty.MEDIUM
         self.CELL_SIZE = 40
+        self._dirty: List[pygame.Rect] = []
+        self._last_drawn: Dict[str, object] = {}
         self.update_grid_size()
         self.theme = Theme.CLASSIC
         self.themes = [Theme.CLASSIC, Theme.DARK, Theme.NATURE]
         self.current_theme = 0
         self.animation = Animation()
-        self.high_scores = {diff: float('inf') for diff in Difficulty}
+        self.rng = np.random.default_rng()
+        self.high_scores = {diff: None for diff in Difficulty}  # None: no win yet
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         self.reset_game()
@@ -266,19 +430,47 @@ class Minesweeper:
         self.active_power_ups: List[PowerUp] = []
         self.power_up_charges = {name: 3 for name in self.power_ups}
         self.themes_tried = set()
-        self.misplaced_flags = []
+        self._held: Set[int] = set()  # Keys currently held, for power-up clicks
+        self._timer_cache: Dict[int, pygame.Surface] = {}
+        self._mines_cache: Dict[int, pygame.Surface] = {}
+        self._notice_cache: Dict[str, pygame.Surface] = {}
         self.load_game()
 
     def update_grid_size(self):
         self.GRID_SIZE, self.MINES = self.difficulty.value
         self.WINDOW_SIZE = self.CELL_SIZE * self.GRID_SIZE
-        self.screen = pygame.display.set_mode((self.WINDOW_SIZE, self.WINDOW_SIZE + 100))
-        pygame.display.set_caption('Enhanced Minesweeper')
+        # NEIGHBORS as flat index deltas (plus their dx) for the flattened board
+        self.neighbor_offsets = np.array([dy * self.GRID_SIZE + dx for dx, dy in self.NEIGHBORS],
+                                         dtype=np.int64)
+        self.neighbor_dxs = np.array([dx for dx, _ in self.NEIGHBORS], dtype=np.int64)
+        self._flood_queue = np.empty(self.GRID_SIZE * self.GRID_SIZE, dtype=np.int32)
+        # Recreating the window is expensive, so skip it when the size is unchanged
+        new_size = (self.WINDOW_SIZE, self.WINDOW_SIZE + 100)
+        if getattr(self, 'screen', None) is None or self.screen.get_size() != new_size:
+            self.screen = pygame.display.set_mode(new_size)
+            pygame.display.set_caption('Enhanced Minesweeper')
+            self.invalidate_cell_cache()
+            self.mark_dirty()
+
+    def invalidate_cell_cache(self):
+        self._cell_cache: Dict[Tuple, pygame.Surface] = {}
+
+    def next_theme(self):
+        self.current_theme = (self.current_theme + 1) % len(self.themes)
+        self.theme = self.themes[self.current_theme]
+        self.themes_tried.add(self.current_theme)
+        self.achievements.check_achievements(self)
+        self.invalidate_cell_cache()
+        self._timer_cache.clear()
+        self._mines_cache.clear()
+        self._notice_cache.clear()
+        self.mark_dirty()
 
     def reset_game(self):
-        self.grid = [[0 for _ in range(self.GRID_SIZE)] for _ in range(self.GRID_SIZE)]
-        self.revealed = [[False for _ in range(self.GRID_SIZE)] for _ in range(self.GRID_SIZE)]
-        self.flagged = [[False for _ in range(self.GRID_SIZE)] for _ in range(self.GRID_SIZE)]
+        shape = (self.GRID_SIZE, self.GRID_SIZE)
+        self.grid = np.zeros(shape, dtype=np.int8)
+        self.revealed = np.zeros(shape, dtype=np.bool_)
+        self.flagged = np.zeros(shape, dtype=np.bool_)
         self.game_over = False
         self.win = False
         self.first_click = True
@@ -288,26 +480,27 @@ class Minesweeper:
         self.combo = 0
         self.max_combo = 0
         self.last_reveal_time = 0
+        self.misplaced_flags: Set[Tuple[int, int]] = set()
         self.animation = Animation()
+        self.mark_dirty()
 
     def place_mines(self, first_x: int, first_y: int):
-        positions = [(x, y) for x in range(self.GRID_SIZE) for y in range(self.GRID_SIZE)
-                    if abs(x - first_x) > 1 or abs(y - first_y) > 1]
-        mine_positions = random.sample(positions, self.MINES)
-        
-        for x, y in mine_positions:
-            self.grid[y][x] = -1
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    new_x, new_y = x + dx, y + dy
-                    if (0 <= new_x < self.GRID_SIZE and 0 <= new_y < self.GRID_SIZE and 
-                        self.grid[new_y][new_x] != -1):
-                        self.grid[new_y][new_x] += 1
+        size = self.GRID_SIZE
+        ys, xs = np.indices((size, size))
+        allowed = (np.abs(xs - first_x) > 1) | (np.abs(ys - first_y) > 1)
+        picks = self.rng.choice(np.flatnonzero(allowed), self.MINES, replace=False)
+        mine_ys, mine_xs = np.divmod(picks, size)
 
-    def reveal_cell(self, x: int, y: int):
-        if not (0 <= x < self.GRID_SIZE and 0 <= y < self.GRID_SIZE) or self.revealed[y][x] or self.flagged[y][x]:
-            return
+        # Neighbour counts are the sum of the eight shifted views of a
+        # zero-padded mine mask
+        mask = np.zeros((size + 2, size + 2), dtype=np.int8)
+        mask[mine_ys + 1, mine_xs + 1] = 1
+        counts = sum(mask[1 + dy:1 + dy + size, 1 + dx:1 + dx + size]
+                     for dx, dy in self.NEIGHBORS)
+        self.grid = np.where(mask[1:-1, 1:-1] == 1, -1, counts).astype(np.int8)
 
+    def update_combo(self):
+        """Advance the combo counter; called once per user reveal action."""
         current_time = time.time()
         if current_time - self.last_reveal_time < 1.0:
             self.combo += 1
@@ -315,57 +508,60 @@ class Minesweeper:
         else:
             self.combo = 1
         self.last_reveal_time = current_time
+        self.achievements.check_achievements(self)
 
-        self.revealed[y][x] = True
-        self.animation.add_reveal(x, y)
+    def reveal_cell(self, x: int, y: int, now: float = None):
+        """Reveal a cell, flooding outward through zero cells breadth-first."""
+        size = self.GRID_SIZE
+        if not (0 <= x < size and 0 <= y < size):
+            return
+        if now is None:
+            now = time.time()  # One start time for the whole cascade
 
-        if self.grid[y][x] == 0:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    self.reveal_cell(x + dx, y + dy)
+        cells = _flood(self.grid.reshape(-1), self.revealed.reshape(-1),
+                       self.flagged.reshape(-1), size, y * size + x,
+                       self.neighbor_offsets, self.neighbor_dxs, self._flood_queue)
+        for i in cells.tolist():
+            cy, cx = divmod(i, size)
+            self.animation.add_reveal(cx, cy, now)
 
     def chord_reveal(self, x: int, y: int):
         """Reveal adjacent cells if the correct number of flags are placed."""
-        if not self.revealed[y][x] or self.grid[y][x] <= 0:
+        if not self.revealed[y, x] or self.grid[y, x] <= 0:
             return False
         
         # Count adjacent flags
-        flag_count = 0
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                new_x, new_y = x + dx, y + dy
-                if (0 <= new_x < self.GRID_SIZE and 
-                    0 <= new_y < self.GRID_SIZE and 
-                    self.flagged[new_y][new_x]):
-                    flag_count += 1
+        flag_count = int(self.flagged[max(y - 1, 0):y + 2, max(x - 1, 0):x + 2].sum())
         
         # If flag count matches the number, reveal adjacent cells
-        if flag_count == self.grid[y][x]:
+        if flag_count == self.grid[y, x]:
+            now = time.time()
             revealed_count = 0
             for dx in [-1, 0, 1]:
                 for dy in [-1, 0, 1]:
                     new_x, new_y = x + dx, y + dy
                     if (0 <= new_x < self.GRID_SIZE and 
                         0 <= new_y < self.GRID_SIZE and 
-                        not self.flagged[new_y][new_x] and
-                        not self.revealed[new_y][new_x]):
-                        if self.grid[new_y][new_x] == -1:
+                        not self.flagged[new_y, new_x] and
+                        not self.revealed[new_y, new_x]):
+                        if self.grid[new_y, new_x] == -1:
                             self.game_over = True
                             self.particles.add_explosion(
                                 new_x * self.CELL_SIZE + self.CELL_SIZE // 2,
                                 new_y * self.CELL_SIZE + self.CELL_SIZE // 2,
-                                self.theme['RED'], 30, 4
+                                self.theme.RED, 30, 4
                             )
                             return True
-                        self.reveal_cell(new_x, new_y)
+                        self.reveal_cell(new_x, new_y, now)
                         revealed_count += 1
-                        self.animation.add_reveal(new_x, new_y, 'chord')
+                        self.animation.add_reveal(new_x, new_y, now, 'chord')
             
             if revealed_count > 0:
+                self.update_combo()
                 self.particles.add_explosion(
                     x * self.CELL_SIZE + self.CELL_SIZE // 2,
                     y * self.CELL_SIZE + self.CELL_SIZE // 2,
-                    self.theme['GREEN'], 15, 2
+                    self.theme.GREEN, 15, 2
                 )
             return True
         return False
@@ -392,45 +588,43 @@ class Minesweeper:
                     self.reset_game()
             # Check if clicking theme button
             elif 50 <= pos[1] <= 80 and 10 <= pos[0] <= 100:
-                self.current_theme = (self.current_theme + 1) % len(self.themes)
-                self.theme = self.themes[self.current_theme]
-                self.themes_tried.add(self.current_theme)
+                self.next_theme()
             return
 
         # Handle power-up activation
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_1] and self.power_up_charges['reveal'] > 0:
+        if pygame.K_1 in self._held and self.power_up_charges['reveal'] > 0:
             self.power_ups['reveal'].activate(self, x, y)
             self.power_up_charges['reveal'] -= 1
-        elif keys[pygame.K_2] and self.power_up_charges['freeze'] > 0:
+        elif pygame.K_2 in self._held and self.power_up_charges['freeze'] > 0:
             self.power_ups['freeze'].activate(self, x, y)
             self.power_up_charges['freeze'] -= 1
-        elif keys[pygame.K_3] and self.power_up_charges['safety'] > 0:
+        elif pygame.K_3 in self._held and self.power_up_charges['safety'] > 0:
             self.power_ups['safety'].activate(self, x, y)
             self.power_up_charges['safety'] -= 1
 
         if right_click:
-            if not self.revealed[y][x]:
-                was_flagged = self.flagged[y][x]
-                self.flagged[y][x] = not was_flagged
+            if not self.revealed[y, x]:
+                was_flagged = self.flagged[y, x]
+                self.flagged[y, x] = not was_flagged
                 self.mines_left += 1 if not was_flagged else -1
+                self.mark_cell_dirty(x, y)
                 
                 # Track misplaced flags
-                if self.grid[y][x] != -1 and not was_flagged:
-                    self.misplaced_flags.append((x, y))
-                elif self.grid[y][x] != -1 and was_flagged:
-                    self.misplaced_flags.remove((x, y))
+                if self.grid[y, x] != -1 and not was_flagged:
+                    self.misplaced_flags.add((x, y))
+                elif self.grid[y, x] != -1 and was_flagged:
+                    self.misplaced_flags.discard((x, y))
                 
                 # Add flag animation
                 if not was_flagged:
-                    self.animation.add_reveal(x, y, 'flag')
+                    self.animation.add_reveal(x, y, time.time(), 'flag')
             return
 
-        if self.flagged[y][x]:
+        if self.flagged[y, x]:
             return
 
         # Try to chord reveal if clicking on a revealed number
-        if self.revealed[y][x] and self.grid[y][x] > 0:
+        if self.revealed[y, x] and self.grid[y, x] > 0:
             if self.chord_reveal(x, y):
                 self.check_win()
                 return
@@ -440,45 +634,43 @@ class Minesweeper:
             self.first_click = False
             self.start_time = time.time()
 
-        if self.grid[y][x] == -1:
+        if self.grid[y, x] == -1:
             if any(p.active for p in self.power_ups.values()):
                 return  # Power-up protection
             self.game_over = True
             self.particles.add_explosion(
                 x * self.CELL_SIZE + self.CELL_SIZE // 2,
                 y * self.CELL_SIZE + self.CELL_SIZE // 2,
-                self.theme['RED'], 30, 4
+                self.theme.RED, 30, 4
             )
             return
 
+        if not self.revealed[y, x]:
+            self.update_combo()
         self.reveal_cell(x, y)
         self.check_win()
-        if self.grid[y][x] == 0:
+        if self.grid[y, x] == 0:
             self.particles.add_explosion(
                 x * self.CELL_SIZE + self.CELL_SIZE // 2,
                 y * self.CELL_SIZE + self.CELL_SIZE // 2,
-                self.theme['BLUE'], 15, 2
+                self.theme.BLUE, 15, 2
             )
 
     def check_win(self):
-        unrevealed = sum(1 for y in range(self.GRID_SIZE) for x in range(self.GRID_SIZE)
-                        if not self.revealed[y][x])
+        unrevealed = int((~self.revealed).sum())
         if unrevealed == self.MINES:
             self.win = True
+            best = self.high_scores[self.difficulty]
             if self.elapsed_time > 0:
-                self.high_scores[self.difficulty] = min(self.high_scores[self.difficulty], self.elapsed_time)
+                self.high_scores[self.difficulty] = (self.elapsed_time if best is None
+                                                     else min(best, self.elapsed_time))
+        self.achievements.check_achievements(self)
 
-    def draw_flag(self, x: int, y: int, offset_y: float = 0):
+    def draw_flag(self, surface: pygame.Surface, base_x: int, base_y: int):
         """Draw a custom flag using Pygame shapes."""
-        # Calculate base position
-        base_x = x * self.CELL_SIZE + self.CELL_SIZE // 2
-        base_y = y * self.CELL_SIZE + self.CELL_SIZE // 2 + 100 + offset_y
-        
         # Draw flag pole
-        pygame.draw.line(self.screen, self.theme['BLACK'],
-                        (base_x - 2, base_y - 15),
-                        (base_x - 2, base_y + 8),
-                        3)
+        pygame.draw.rect(surface, self.theme.BLACK,
+                        (base_x - 3, base_y - 15, 3, 24))
         
         # Draw flag triangle
         flag_points = [
@@ -486,59 +678,122 @@ class Minesweeper:
             (base_x + 12, base_y - 10),  # Triangle tip
             (base_x - 2, base_y - 5)     # Pole middle
         ]
-        pygame.draw.polygon(self.screen, self.theme['RED'], flag_points)
+        pygame.draw.polygon(surface, self.theme.RED, flag_points)
+
+    def draw_mine(self, surface: pygame.Surface, center_x: int, center_y: int):
+        """Draw a custom mine using Pygame shapes."""
+        radius = self.CELL_SIZE // 4
+        
+        # Draw main circle
+        pygame.draw.circle(surface, self.theme.BLACK, (center_x, center_y), radius)
+        
+        # Draw spikes
+        for angle in range(0, 360, 45):
+            rad = math.radians(angle)
+            start_x = center_x + math.cos(rad) * radius
+            start_y = center_y + math.sin(rad) * radius
+            end_x = center_x + math.cos(rad) * (radius + 4)
+            end_y = center_y + math.sin(rad) * (radius + 4)
+            pygame.draw.line(surface, self.theme.BLACK, 
+                           (start_x, start_y), (end_x, end_y), 2)
+        
+        # Draw shine
+        shine_pos = (center_x - radius//3, center_y - radius//3)
+        pygame.draw.circle(surface, self.theme.WHITE, shine_pos, 2)
+
+    def render_cell_sprite(self, key: Tuple, size: int) -> pygame.Surface:
+        """Rasterize one cell state at the given (animated) pixel size."""
+        sprite = pygame.Surface((size, size))
+        rect = (0, 0, size, size)
+        # Content stays centred on the unscaled cell, as if drawn on screen
+        offset = (self.CELL_SIZE - size) // 2
+        center = (self.CELL_SIZE // 2 - offset, self.CELL_SIZE // 2 - offset)
+        
+        if key[0] == 'hidden':
+            pygame.draw.rect(sprite, self.theme.DARK_GRAY, rect)
+            pygame.draw.rect(sprite, self.theme.WHITE, rect, 1)
+        else:
+            pygame.draw.rect(sprite, self.theme.WHITE, rect)
+            pygame.draw.rect(sprite, self.theme.GRAY, rect, 1)
+            
+            if key[0] == 'mine':
+                sprite.blit(self.get_glyph('mine'), (-offset, -offset))
+            elif key[1] > 0:
+                number_text = self.font.render(str(key[1]), True, 
+                                             self.theme.NUMBERS[key[1] - 1])
+                sprite.blit(number_text, number_text.get_rect(center=center))
+        return sprite
+
+    def get_glyph(self, name: str) -> pygame.Surface:
+        """The mine or flag shape, rendered once per theme onto a transparent cell."""
+        glyph = self._cell_cache.get(name)
+        if glyph is None:
+            glyph = pygame.Surface((self.CELL_SIZE, self.CELL_SIZE), pygame.SRCALPHA)
+            center = (self.CELL_SIZE // 2, self.CELL_SIZE // 2)
+            if name == 'mine':
+                self.draw_mine(glyph, *center)
+            else:
+                self.draw_flag(glyph, *center)
+            self._cell_cache[name] = glyph
+        return glyph
+
+    def get_cell_sprite(self, key: Tuple, size: int) -> pygame.Surface:
+        sprite = self._cell_cache.get((key, size))
+        if sprite is None:
+            sprite = self._cell_cache[(key, size)] = self.render_cell_sprite(key, size)
+        return sprite
 
     def draw_cell(self, x: int, y: int, rect: Tuple[int, int, int, int]):
         scale = self.animation.get_cell_scale(x, y)
         scaled_size = int(self.CELL_SIZE * scale)
         offset = (self.CELL_SIZE - scaled_size) // 2
-        scaled_rect = (rect[0] + offset, rect[1] + offset, scaled_size, scaled_size)
         
-        if not self.revealed[y][x]:
-            pygame.draw.rect(self.screen, self.theme['DARK_GRAY'], scaled_rect)
-            pygame.draw.rect(self.screen, self.theme['WHITE'], scaled_rect, 1)
-            if self.flagged[y][x]:
-                flag_offset = self.animation.get_flag_offset()
-                self.draw_flag(x, y, flag_offset)
+        if not self.revealed[y, x]:
+            key = ('hidden',)
+        elif self.grid[y, x] > 0:
+            key = ('revealed', int(self.grid[y, x]))
+        elif self.grid[y, x] == -1 and self.game_over:
+            key = ('mine',)
         else:
-            pygame.draw.rect(self.screen, self.theme['WHITE'], scaled_rect)
-            pygame.draw.rect(self.screen, self.theme['GRAY'], scaled_rect, 1)
-            
-            if self.grid[y][x] > 0:
-                number_text = self.font.render(str(self.grid[y][x]), True, 
-                                             self.theme['NUMBERS'][self.grid[y][x] - 1])
-                number_rect = number_text.get_rect()
-                number_rect.center = (x * self.CELL_SIZE + self.CELL_SIZE // 2,
-                                    y * self.CELL_SIZE + self.CELL_SIZE // 2 + 100)
-                self.screen.blit(number_text, number_rect)
-            elif self.grid[y][x] == -1 and self.game_over:
-                # Draw a custom mine
-                center_x = x * self.CELL_SIZE + self.CELL_SIZE // 2
-                center_y = y * self.CELL_SIZE + self.CELL_SIZE // 2 + 100
-                radius = self.CELL_SIZE // 4
-                
-                # Draw main circle
-                pygame.draw.circle(self.screen, self.theme['BLACK'], (center_x, center_y), radius)
-                
-                # Draw spikes
-                for angle in range(0, 360, 45):
-                    rad = math.radians(angle)
-                    start_x = center_x + math.cos(rad) * radius
-                    start_y = center_y + math.sin(rad) * radius
-                    end_x = center_x + math.cos(rad) * (radius + 4)
-                    end_y = center_y + math.sin(rad) * (radius + 4)
-                    pygame.draw.line(self.screen, self.theme['BLACK'], 
-                                   (start_x, start_y), (end_x, end_y), 2)
-                
-                # Draw shine
-                shine_pos = (center_x - radius//3, center_y - radius//3)
-                pygame.draw.circle(self.screen, self.theme['WHITE'], shine_pos, 2)
-
-    def draw(self):
-        self.screen.fill(self.theme['GRAY'])
+            key = ('revealed', 0)
+        self.screen.blit(self.get_cell_sprite(key, scaled_size),
+                         (rect[0] + offset, rect[1] + offset))
         
-        # Draw top bar
-        pygame.draw.rect(self.screen, self.theme['DARK_GRAY'], (0, 0, self.WINDOW_SIZE, 100))
+        if not self.revealed[y, x] and self.flagged[y, x]:
+            # Snap the wave to whole pixels so unchanged frames can be skipped
+            flag_offset = round(self.animation.get_flag_offset())
+            self.screen.blit(self.get_glyph('flag'), (rect[0], rect[1] + flag_offset))
+
+    def mark_dirty(self, rect=None):
+        """Queue a screen region for repaint; no rect means the whole window."""
+        self._dirty.append(pygame.Rect(rect) if rect else self.screen.get_rect())
+
+    def mark_cell_dirty(self, x: int, y: int):
+        # Animated cells grow past their bounds, so include a margin
+        margin = self.CELL_SIZE // 10 + 1
+        self._dirty.append(pygame.Rect(x * self.CELL_SIZE - margin,
+                                       y * self.CELL_SIZE + 100 - margin,
+                                       self.CELL_SIZE + 2 * margin,
+                                       self.CELL_SIZE + 2 * margin))
+
+    def _changed(self, name: str, value) -> bool:
+        """Record the last drawn value of some on-screen state; True on change."""
+        if name in self._last_drawn and self._last_drawn[name] == value:
+            return False
+        self._last_drawn[name] = value
+        return True
+
+    def render_stat(self, cache: Dict[int, pygame.Surface], label: str, value: int) -> pygame.Surface:
+        """Render a top-bar counter, reusing the surface while the value is unchanged."""
+        text = cache.get(value)
+        if text is None:
+            if len(cache) >= self.TEXT_CACHE_SIZE:
+                del cache[next(iter(cache))]  # Evict the oldest entry
+            text = cache[value] = self.font.render(f'{label}: {value}', True, self.theme.WHITE)
+        return text
+
+    def draw_top_bar(self):
+        pygame.draw.rect(self.screen, self.theme.DARK_GRAY, (0, 0, self.WINDOW_SIZE, 100))
         
         # Calculate dynamic spacing based on window size
         button_width = min(80, self.WINDOW_SIZE // 5)
@@ -546,16 +801,16 @@ class Minesweeper:
         
         # Draw difficulty buttons with adjusted spacing
         for i, diff in enumerate([Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD]):
-            color = self.theme['WHITE'] if diff == self.difficulty else self.theme['GRAY']
+            color = self.theme.WHITE if diff == self.difficulty else self.theme.GRAY
             button_x = 10 + i * button_spacing
             pygame.draw.rect(self.screen, color, (button_x, 10, button_width, 30))
-            text = self.small_font.render(diff.name, True, self.theme['BLACK'])
+            text = self.small_font.render(diff.name, True, self.theme.BLACK)
             text_rect = text.get_rect(center=(button_x + button_width//2, 25))
             self.screen.blit(text, text_rect)
 
         # Draw theme button
-        pygame.draw.rect(self.screen, self.theme['WHITE'], (10, 50, button_width, 30))
-        text = self.small_font.render('Theme', True, self.theme['BLACK'])
+        pygame.draw.rect(self.screen, self.theme.WHITE, (10, 50, button_width, 30))
+        text = self.small_font.render('Theme', True, self.theme.BLACK)
         text_rect = text.get_rect(center=(10 + button_width//2, 65))
         self.screen.blit(text, text_rect)
         
@@ -563,14 +818,12 @@ class Minesweeper:
         right_margin = self.WINDOW_SIZE - 10
         
         # Draw timer
-        if self.start_time:
-            self.elapsed_time = int(time.time() - self.start_time)
-        timer_text = self.font.render(f'Time: {self.elapsed_time}', True, self.theme['WHITE'])
+        timer_text = self.render_stat(self._timer_cache, 'Time', self.elapsed_time)
         timer_rect = timer_text.get_rect(right=right_margin, top=15)
         self.screen.blit(timer_text, timer_rect)
         
         # Draw mines counter
-        mines_text = self.font.render(f'Mines: {self.mines_left}', True, self.theme['WHITE'])
+        mines_text = self.render_stat(self._mines_cache, 'Mines', self.mines_left)
         mines_rect = mines_text.get_rect(right=right_margin, top=55)
         self.screen.blit(mines_text, mines_rect)
 
@@ -583,7 +836,7 @@ class Minesweeper:
         power_up_spacing = min(100, center_width // len(power_up_icons))
         for i, (name, charges) in enumerate(self.power_up_charges.items()):
             # Draw icon
-            icon_text = self.font.render(power_up_icons[name], True, self.theme['WHITE'])
+            icon_text = self.font.render(power_up_icons[name], True, self.theme.WHITE)
             x_pos = center_start_x + i * power_up_spacing
             icon_rect = icon_text.get_rect(centerx=x_pos + 20, centery=25)
             self.screen.blit(icon_text, icon_rect)
@@ -593,36 +846,54 @@ class Minesweeper:
             dot_radius = 3
             for j in range(charges):
                 dot_x = x_pos + 20 + (j - 1) * (dot_radius * 3)
-                pygame.draw.circle(self.screen, self.theme['WHITE'], 
+                pygame.draw.circle(self.screen, self.theme.WHITE, 
                                 (int(dot_x), dot_y), dot_radius)
 
         # Draw combo below power-ups
         if self.combo > 1:
-            combo_text = self.font.render(f'Combo: {self.combo}!', True, self.theme['RED'])
+            combo_text = self.font.render(f'Combo: {self.combo}!', True, self.theme.RED)
             combo_rect = combo_text.get_rect(centerx=center_start_x + center_width//2, top=55)
             self.screen.blit(combo_text, combo_rect)
-        
-        # Draw particles
-        self.particles.update_and_draw(self.screen)
-        
-        # Draw achievement notifications with adjusted positioning
-        current_time = time.time()
+
+    def visible_notifications(self, now: float) -> List[Achievement]:
+        return [achievement for achievement in self.achievements.achievements.values()
+                if achievement.unlocked and achievement.unlock_time and
+                now - achievement.unlock_time < 3]
+
+    def draw_notifications(self, now: float):
+        """Draw achievement notifications with adjusted positioning."""
         y_offset = 150
-        for achievement in self.achievements.achievements.values():
-            if (achievement.unlocked and achievement.unlock_time and 
-                current_time - achievement.unlock_time < 3):
-                text = self.font.render(
+        for achievement in self.visible_notifications(now):
+            # Rendered once per theme; render() may run several times a frame
+            text = self._notice_cache.get(achievement.name)
+            if text is None:
+                text = self._notice_cache[achievement.name] = self.font.render(
                     f'{achievement.icon} {achievement.name} unlocked!',
-                    True, self.theme['GREEN']
+                    True, self.theme.GREEN
                 )
-                text_rect = text.get_rect(center=(self.WINDOW_SIZE // 2, y_offset))
-                self.screen.blit(text, text_rect)
-                y_offset += 40
-
-        # Draw grid
-        self.animation.update()
-        for y in range(self.GRID_SIZE):
-            for x in range(self.GRID_SIZE):
+            text_rect = text.get_rect(center=(self.WINDOW_SIZE // 2, y_offset))
+            self.screen.blit(text, text_rect)
+            y_offset += 40
+
+    def render(self, area: pygame.Rect, now: float):
+        """Repaint everything that overlaps `area`, clipped to it."""
+        self.screen.set_clip(area)
+        self.screen.fill(self.theme.GRAY)
+        
+        if area.top < 100:
+            self.draw_top_bar()
+        
+        self.particles.draw(self.screen)
+        self.draw_notifications(now)
+
+        # Draw only the cells whose (possibly scaled) footprint meets the area
+        margin = self.CELL_SIZE // 10 + 1
+        x0 = max(0, (area.left - margin) // self.CELL_SIZE)
+        x1 = min(self.GRID_SIZE, (area.right + margin) // self.CELL_SIZE + 1)
+        y0 = max(0, (area.top - 100 - margin) // self.CELL_SIZE)
+        y1 = min(self.GRID_SIZE, (area.bottom - 100 + margin) // self.CELL_SIZE + 1)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
                 rect = (x * self.CELL_SIZE, y * self.CELL_SIZE + 100, 
                        self.CELL_SIZE, self.CELL_SIZE)
                 self.draw_cell(x, y, rect)
@@ -631,34 +902,78 @@ class Minesweeper:
             self.draw_game_over()
         elif self.win:
             self.draw_win()
+        self.screen.set_clip(None)
+
+    def draw(self):
+        now = time.time()
+        if self.start_time:
+            self.elapsed_time = int(now - self.start_time)
+        self.animation.update(now)
+        self.particles.update(now)
 
-        pygame.display.flip()
+        # Work out which parts of the screen changed since the last frame
+        if self._changed('pulse', int(self.CELL_SIZE * self.animation.reveal_radius)):
+            self.mark_dirty()
+        if self._changed('overlay', (self.game_over, self.win,
+                                     self.elapsed_time if self.win else None)):
+            self.mark_dirty()
+        if self._changed('notifications', [a.name for a in self.visible_notifications(now)]):
+            self.mark_dirty()
+        if self._changed('top_bar', (self.elapsed_time, self.mines_left, self.combo,
+                                     tuple(self.power_up_charges.values()))):
+            self.mark_dirty((0, 0, self.WINDOW_SIZE, 100))
+        if self._changed('flag_offset', round(self.animation.get_flag_offset())):
+            for y, x in np.argwhere(self.flagged & ~self.revealed).tolist():
+                self.mark_cell_dirty(x, y)
+        for x, y in self.animation.changed_cells():
+            self.mark_cell_dirty(x, y)
+        bounds = self.particles.bounds()
+        for rect in (self._last_drawn.get('particles'), bounds):
+            if rect:
+                self.mark_dirty(rect)
+        self._last_drawn['particles'] = bounds
+
+        if not self._dirty:
+            return
+        screen_rect = self.screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in self._dirty]
+        if len(dirty) > 16:
+            dirty = [dirty[0].unionall(dirty[1:])]
+        # Merge everything touching the top bar so it is repainted at most once
+        bar = [rect for rect in dirty if rect.top < 100]
+        if len(bar) > 1:
+            dirty = [rect for rect in dirty if rect.top >= 100] + [bar[0].unionall(bar[1:])]
+        for rect in dirty:
+            if rect:
+                self.render(rect, now)
+        pygame.display.update(dirty)
+        self._dirty.clear()
 
     def draw_game_over(self):
         surface = pygame.Surface((self.WINDOW_SIZE, self.WINDOW_SIZE + 100))
         surface.set_alpha(128)
-        surface.fill(self.theme['BLACK'])
+        surface.fill(self.theme.BLACK)
         self.screen.blit(surface, (0, 0))
         
-        text = self.font.render('Game Over! Press R to restart', True, self.theme['WHITE'])
+        text = self.font.render('Game Over! Press R to restart', True, self.theme.WHITE)
         text_rect = text.get_rect(center=(self.WINDOW_SIZE // 2, self.WINDOW_SIZE // 2))
         self.screen.blit(text, text_rect)
         
-        score_text = self.font.render(f'Max Combo: {self.max_combo}', True, self.theme['WHITE'])
+        score_text = self.font.render(f'Max Combo: {self.max_combo}', True, self.theme.WHITE)
         self.screen.blit(score_text, (self.WINDOW_SIZE // 2 - 100, self.WINDOW_SIZE // 2 + 50))
 
     def draw_win(self):
         surface = pygame.Surface((self.WINDOW_SIZE, self.WINDOW_SIZE + 100))
         surface.set_alpha(128)
-        surface.fill(self.theme['GREEN'])
+        surface.fill(self.theme.GREEN)
         self.screen.blit(surface, (0, 0))
         
-        text = self.font.render(f'You Win! Time: {self.elapsed_time}s', True, self.theme['WHITE'])
+        text = self.font.render(f'You Win! Time: {self.elapsed_time}s', True, self.theme.WHITE)
         text_rect = text.get_rect(center=(self.WINDOW_SIZE // 2, self.WINDOW_SIZE // 2))
         self.screen.blit(text, text_rect)
         
         if self.elapsed_time == self.high_scores[self.difficulty]:
-            high_score_text = self.font.render('New Best Time!', True, self.theme['WHITE'])
+            high_score_text = self.font.render('New Best Time!', True, self.theme.WHITE)
             self.screen.blit(high_score_text, (self.WINDOW_SIZE // 2 - 100, self.WINDOW_SIZE // 2 + 50))
 
     def save_game(self):
@@ -676,10 +991,11 @@ class Minesweeper:
             with open('minesweeper_save.json', 'r') as f:
                 save_data = json.load(f)
                 for diff_name, score in save_data['high_scores'].items():
-                    self.high_scores[Difficulty[diff_name]] = score
+                    # Older saves stored a missing score as Infinity
+                    self.high_scores[Difficulty[diff_name]] = None if score == float('inf') else score
                 for name, unlocked in save_data['achievements'].items():
                     if unlocked:
-                        self.achievements.achievements[name].unlock()
+                        self.achievements.unlock(name)
                 self.power_up_charges = save_data['power_up_charges']
                 self.themes_tried = set(save_data['themes_tried'])
         except FileNotFoundError:
@@ -688,6 +1004,7 @@ class Minesweeper:
     def run(self):
         running = True
         last_save = time.time()
+        clock = pygame.time.Clock()
         
         while running:
             current_time = time.time()
@@ -695,7 +1012,8 @@ class Minesweeper:
                 self.save_game()
                 last_save = current_time
             
-            for event in pygame.event.get():
+            events = pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.save_game()
                     running = False
@@ -703,16 +1021,23 @@ class Minesweeper:
                     if event.button in (1, 3):
                         self.handle_click(event.pos, event.button == 3)
                 elif event.type == pygame.KEYDOWN:
+                    self._held.add(event.key)
                     if event.key == pygame.K_r:
                         self.reset_game()
                     elif event.key == pygame.K_t:
-                        self.current_theme = (self.current_theme + 1) % len(self.themes)
-                        self.theme = self.themes[self.current_theme]
-                        self.themes_tried.add(self.current_theme)
+                        self.next_theme()
+                elif event.type == pygame.KEYUP:
+                    self._held.discard(event.key)
+                elif event.type == pygame.WINDOWFOCUSLOST:
+                    self._held.clear()  # KEYUP never arrives for keys released elsewhere
 
-            self.achievements.check_achievements(self)
             self.draw()
 
+            # Run at full rate while something is moving; otherwise only the
+            # pulse, flag wave and timer change, and they look fine at IDLE_FPS
+            busy = events or self.animation.active_cells or self.particles.count
+            clock.tick(self.FPS if busy else self.IDLE_FPS)
+
         pygame.quit()
 
 if __name__ == '__main__':